@@ -1,8 +1,22 @@
+import re
 import sys
+import select
 import json 
 import logging
-from typing import Dict, Any, Optional, Callable
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Union
+
+# orjson is optional - fall back to the stdlib json module if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pysimdjson is optional too - when available it parses lazily so we only pay
+# for the envelope fields we actually read
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 # configure logging for stderr only 
 logging.basicConfig(
@@ -13,40 +27,82 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# JSON codec used on the hot path. Both functions work on UTF-8 bytes so we
+# never have to decode stdin or encode stdout ourselves.
+def _json_dumps(obj: Any) -> bytes:
+    """Compact stdlib serialization (used when orjson is missing or rejects a value)."""
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
-# create the parsed json message with validation
-@dataclass
-class JsonRpcMessage:
-    """
-    Respresents a parsed JSON-RPC message with validation.
-
-    Attributes:
-        jsonrpc: Protocol version (must be "2.0")
-        method: RPC method name (for requests)
-        params: Method parameters (optional)
-        id: Request identifier (none for notiofications)
-        result: Response restult (for response)
-        error: Error object (for error responses)
-    """
-    jsonrpc: str
-    method: Optional[str] = None
-    params: Optional[Dict[str, Any]] = None
-    id: Optional[Any] = None
-    result: Optional[Any] = None
-    error: Optional[Dict[str, Any]] = None
 
-    # check if this is a request message
-    def is_request(self) -> bool:
-        return self.method is not None and self.id is not None
+if orjson is not None:
+    def _loads(raw: bytes) -> Any:
+        data = orjson.loads(raw)
+        # orjson turns integers outside the 64-bit range into floats, but the id
+        # has to be echoed back exactly - re-parse those messages with the stdlib
+        if type(data) is dict and type(data.get('id')) is float:
+            exact = json.loads(raw)
+            if type(exact.get('id')) is int:
+                return exact
+        return data
 
-    
-    # check if this is a notification
-    def is_notification(self) -> bool: 
-        return self.method is not None and self.id is None
+    def _dumps(obj: Any) -> bytes:
+        # default options already give compact output
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects some values json.dumps accepts (non-str dict keys,
+            # ints outside 64 bits) - hand those to the stdlib; a genuinely
+            # unserializable object raises again there
+            return _json_dumps(obj)
+else:
+    _loads = json.loads
+    _dumps = _json_dumps
+
+
+# well-known method names, interned so registry keys share a single str object
+_M_INITIALIZE = sys.intern('initialize')
+_M_INITIALIZED = sys.intern('notifications/intitialized')
+_M_PING = sys.intern('ping')
+
+# pre-serialized response pieces - success replies are formatted straight to
+# bytes instead of building an envelope dict per reply
+_SUCCESS_TEMPLATE = b'{"jsonrpc":"2.0","id":%b,"result":%b}'
+_PONG = {"status": "pong"}
+_PONG_RESULT = b'{"status":"pong"}'
+_PONG_TEMPLATE = b'{"jsonrpc":"2.0","id":%b,"result":{"status":"pong"}}'
+
+# start of the error pysimdjson raises when a Parser is reused while proxies
+# from its previous document are still alive
+_PARSER_IN_USE_ERROR = 'Tried to re-use a parser'
+
+# optional LSP-style framing ("Content-Length: N\r\n\r\n<body>") negotiated in initialize
+_FRAMING_LENGTH_PREFIXED = 'length-prefixed'
+_CONTENT_LENGTH_HEADER = b'Content-Length: %d\r\n\r\n'
+# largest body we'll read in one go - anything bigger is treated as a bad frame
+_MAX_CONTENT_LENGTH = 64 * 1024 * 1024
+
+# matches a bare ping request - exactly the jsonrpc, method and id members (in
+# any order) with a plain integer or escape-free ASCII string id - so it can be
+# answered without parsing. Anything else goes through the normal path.
+_PING_MEMBER = (rb'\s*(?:"jsonrpc"\s*:\s*"2\.0"|"method"\s*:\s*"ping"'
+                rb'|"id"\s*:\s*(?P<id%d>0|-?[1-9][0-9]*|"[\x20\x21\x23-\x5b\x5d-\x7e]*"))\s*')
+_PING_RE = re.compile(
+    rb'(?=.*"jsonrpc"\s*:)(?=.*"method"\s*:)(?=.*"id"\s*:)\s*\{'
+    + (_PING_MEMBER % 1) + rb',' + (_PING_MEMBER % 2) + rb',' + (_PING_MEMBER % 3)
+    + rb'\}\s*',
+    re.DOTALL
+)
+
+
+def _materialize(value: Any) -> Any:
+    """Convert a lazy simdjson proxy into plain Python objects (no-op otherwise)."""
+    if simdjson is not None:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
 
-    # check if this is a response (has id but no method)
-    def is_response(self) -> bool:
-        return self.method is None and self.id is not None
 
 class MCPServer:
     """
@@ -62,14 +118,31 @@ class MCPServer:
         self.running = False
         self.initialized = False
 
+        # binary stdio streams - skips the TextIOWrapper codec/newline layer
+        self._stdin = sys.stdin.buffer
+        self._stdout = sys.stdout.buffer
+
+        # message framing: newline-delimited until the client negotiates
+        # length-prefixed framing in initialize. The switch is made once the
+        # initialize response has been sent, so that response is still newline-framed
+        self._length_prefixed = False
+        self._length_prefixed_pending = False
+
+        # reusable lazy JSON parser (None when pysimdjson isn't installed); the
+        # document it returns is only valid until the next frame is parsed
+        self._parser = simdjson.Parser() if simdjson is not None else None
+
         # register built in handlers
         self._register_builtin_handlers()
 
+        # build the specialized dispatcher (self._dispatch_message)
+        self.freeze()
+
     def _register_builtin_handlers(self):
         """Register essential MCP protocol handlers"""
-        self.handlers['initialize'] = self._handle_initialize
-        self.handlers['notifications/intitialized'] = self._handle_initialized
-        self.handlers['ping'] = self._handle_ping
+        self.handlers[_M_INITIALIZE] = self._handle_initialize
+        self.handlers[_M_INITIALIZED] = self._handle_initialized
+        self.handlers[_M_PING] = self._handle_ping
 
     def register_handler(self, method: str, handler: Callable):
         """Register a handler function for a specified RPC method
@@ -77,10 +150,25 @@ class MCPServer:
         Args:
             method: The RPC method name (e.g. 'tools/call')
             handler: Functio that takes (params, message_id) and returns the result
+
+        Notes:
+            - params is always plain Python data (dict/list/None), so handlers may
+              keep it - the parsed message itself is only valid during dispatch
         """
-        # update the handlers registry
+        # update the handlers registry - the dispatcher holds a reference to this
+        # dict, so new handlers are picked up without rebuilding it
         self.handlers[method] = handler
 
+    def freeze(self):
+        """Build the dispatcher specialized for the current handler table.
+
+        Notes:
+            - Called from __init__; handlers registered later through
+              register_handler are still seen by the dispatcher
+            - Call again after replacing self.handlers with a new dict
+        """
+        self._dispatch_message = self._build_dispatcher()
+
     def run(self):
         """
         Main event loop implementing the five core steps/
@@ -89,91 +177,222 @@ class MCPServer:
         2. Parses each line as JSON
         3. Dispatches to appropriate handlers
         4. Writes JSON resonses to stdout
-        5. Flushes stdout after each message
+        5. Flushes stdout once no more input is pending
         """
 
         logging.info("Starting MCP server event loop")
         self.running = True
 
+        # bind the per-iteration callables to locals once, so the loop does
+        # fast local loads instead of attribute lookups on self
+        read_line = self._read_line_from_stdin
+        run_once = self._run_once
+        write_response = self._write_response_to_stdout
+        input_pending = self._input_pending
+        flush_stdout = self._flush_stdout
+
         try:
             while self.running:
                 # 1. read lines from stdin
-                raw_line = self._read_line_from_stdin()
+                raw_line = read_line()
                 if raw_line is None:
                     # EOF reached = client closed connection
                     logging.info("EOF reached on stdin, shutting down")
+                    flush_stdout()
                     break
 
-                # 2. parse each line as JSON
-                message = self._parse_json_message(raw_line)
-                if message is None:
-                    # parsing failed - continue to next message
-                    continue
-
-                # 3. dispatch appropriate event handlers
-                response = self._dispatch_message(message)
+                # 2-3. parse and dispatch the frame
+                response = run_once(raw_line)
 
                 # 4. write JSON response to stdout (if response is needed)
                 if response is not None:
-                    self._write_response_to_stdout(response)
+                    write_response(response)
 
-                # 5. Flush stdout after each message
-                self._flush_stdout()
+                # 5. Flush stdout - deferred while more frames are already queued on
+                # stdin so a burst is written out in one go; a lone request still
+                # gets flushed straight away
+                if not input_pending():
+                    flush_stdout()
 
         except KeyboardInterrupt:
             logger.info("Recieved keyboard interrupt, shutting down")
         except Exception as e:
-            logger.error(f'Unexpected error in the event loop: {e}', exc_info=True)
+            logger.error('Unexpected error in the event loop: %s', e, exc_info=True)
         finally:
             self._cleanup()
         
 
-    def _read_line_from_stdin(self) -> Optional[str]:
+    def _read_line_from_stdin(self) -> Optional[bytes]:
         """
         STEP 1: First we need to read a complete line from stdin.
 
         Returns:
-            The line as a string (without newline), or None if EOF
+            The raw line as UTF-8 bytes (including the newline), or None if EOF
 
         Notes: 
             - Blocks until a complete line is available
             - Return None on EOF (client disconnected)
-            - Handles encoding issues gracefully
+            - Doesn't decode - invalid UTF-8 is reported by the JSON parser
+            - With length-prefixed framing negotiated, reads one Content-Length
+              framed message body instead of a line
         """
+        if self._length_prefixed:
+            return self._read_length_prefixed_frame()
 
-        try: 
-            
-            line = sys.stdin.readline()
-            if not line:
+        # loop rather than recurse so long runs of skipped lines can't grow the stack
+        while True:
+            try:
+                # read bytes directly - the JSON parser handles UTF-8 itself
+                line = self._stdin.readline()
+                if not line:
+                    return None
+
+                # the trailing newline is left in place - the JSON parsers ignore whitespace
+
+                # skip empty lines (isspace is a single scan with no copy, unlike strip)
+                if line.isspace():
+                    logger.debug("Skipping empty line")
+                    continue
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Read line: %s...', line[:100])
+                return line
+
+            except Exception as e:
+                logger.error("Error reading line from stdin: %s", e)
                 return None
 
-            # strip the new line character
-            line = line.rstrip('\n\r')
+    def _run_once(self, raw_line: bytes) -> Optional[Union[bytes, Dict[str, Any]]]:
+        """
+        STEPS 2-3: Turn one raw frame into its response.
+
+        Args:
+            raw_line: The raw bytes from stdin
 
-            # skip empty lines
-            if not line.strip():
-                logger.debug("Skipping empty line")
-                return self._read_line_from_stdin()
-            
-            logger.debug(f'Read line: {line[:100]}...')
-            return line
+        Returns:
+            The response to write (see _dispatch_message), or None when there is
+            nothing to send back
+
+        Notes:
+            - This is the whole per-message hot path, kept free of I/O so it can
+              be swapped for a compiled implementation by rebinding it on the server
+        """
+        # bare pings are answered straight from the raw bytes
+        response = self._fast_ping_response(raw_line)
+        if response is not None:
+            return response
+
+        # 2. parse each line as JSON
+        message = self._parse_json_message(raw_line)
+
+        # parsing failed - nothing to dispatch, move on to the next message
+        if message is None:
+            return None
+
+        # 3. dispatch appropriate event handlers; the lazy parser proxies are
+        # released when this frame returns, so the parser can be reused
+        return self._dispatch_message(message)
+
+    def _read_length_prefixed_frame(self) -> Optional[bytes]:
+        """
+        Read one "Content-Length: N\\r\\n\\r\\n<body>" framed message from stdin.
+
+        Returns:
+            The message body as bytes, or None if EOF (or the stream can't be read)
+
+        Notes:
+            - The body is read with a single read(N) - no scanning for newlines
+            - Header names are case-insensitive; headers other than Content-Length are ignored
+            - A message with a missing, invalid or oversized Content-Length is skipped
+              by scanning ahead to the next Content-Length header
+        """
+        try:
+            # set when a frame can't be trusted - its body length is unknown, so
+            # we skip ahead to the next Content-Length header to get back in sync
+            resync = False
+            while True:
+                content_length = None
+                seen_header = False
+                while True:
+                    # bounded, since while resyncing this may be a body of unknown size
+                    header = self._stdin.readline(_MAX_CONTENT_LENGTH)
+                    if not header:
+                        return None
+
+                    if resync:
+                        # the next header may follow straight on from the skipped
+                        # body, which has no newline of its own - take the last
+                        # match, since the body itself may contain the text
+                        start = header.lower().rfind(b'content-length:')
+                        if start < 0:
+                            continue
+                        header = header[start:]
+                        resync = False
+
+                    if header.isspace():
+                        # blank line ends the header block (or is stray padding before one)
+                        if content_length is not None:
+                            break
+                        if seen_header:
+                            logger.error("Missing Content-Length header, skipping message")
+                            resync = True
+                        continue
+
+                    seen_header = True
+                    name, _, value = header.partition(b':')
+                    if name.strip().lower() == b'content-length':
+                        try:
+                            content_length = int(value)
+                        except ValueError:
+                            content_length = -1
+                        if not 0 <= content_length <= _MAX_CONTENT_LENGTH:
+                            logger.error("Invalid Content-Length header: %s", header[:100])
+                            content_length = None
+                            resync = True
+
+                body = self._stdin.read(content_length)
+                if len(body) < content_length:
+                    # EOF in the middle of a message
+                    return None
+                if not body:
+                    logger.debug("Skipping empty message")
+                    continue
+                return body
 
-        except UnicodeDecodeError as e:
-            logger.error(f"Uniconde decode error reading stdin: {e}")
-            return self._read_line_from_stdin() # try next line
         except Exception as e:
-            logger.error(f"Error reading line from stdin: {e}")
+            logger.error("Error reading message from stdin: %s", e)
             return None
 
-    def _parse_json_message(self, raw_line: str) -> Optional[JsonRpcMessage]:
+    def _fast_ping_response(self, raw_line: bytes) -> Optional[bytes]:
+        """
+        Answer a bare ping request without parsing or dispatching it.
+
+        Args:
+            raw_line: The raw bytes from stdin
+
+        Returns:
+            The serialized pong response, or None if the line isn't a bare ping
+            (or the ping handler has been replaced) and needs the full path
+        """
+        if b'"ping"' not in raw_line:
+            return None
+        match = _PING_RE.fullmatch(raw_line)
+        if match is None or self.handlers.get(_M_PING) != self._handle_ping:
+            return None
+        # only one of the three member slots captured the id
+        msg_id = match.group('id1') or match.group('id2') or match.group('id3')
+        logger.debug("Fast-path ping")
+        return _PONG_TEMPLATE % msg_id
+
+    def _parse_json_message(self, raw_line: bytes) -> Optional[Any]:
         """
         STEP 2: After reading the complete line from stdin, we parse as a JSON-RPC message.
 
         Args:
-            raw_line: The raw string from stdin
+            raw_line: The raw bytes from stdin
 
         Returns:
-            Parsed JsonRpcMessage object, or None if parsing fails
+            The parsed JSON object (a dict, or a lazy simdjson Object), or None if parsing fails
         
         Notes:
             - Validates JSON-RPC 2.0 format
@@ -182,112 +401,155 @@ class MCPServer:
         """
         try:
             # parse the JSON
-            data = json.loads(raw_line)
-            logger.debug(f"Parsed JSON: {data}")
+            if self._parser is not None:
+                try:
+                    # lazy parse - fields are only decoded when we .get() them. The
+                    # parser recycles one internal buffer across calls, which it can
+                    # only do once every proxy from the previous frame is gone
+                    data = self._parser.parse(raw_line)
+                    is_object = isinstance(data, simdjson.Object)
+                except (ValueError, RuntimeError) as e:
+                    if _PARSER_IN_USE_ERROR in str(e):
+                        # something still holds a proxy from an earlier frame - give
+                        # later frames a fresh parser; this one is parsed below
+                        logger.warning("JSON parser still in use, allocating a new one")
+                        self._parser = simdjson.Parser()
+                    # otherwise simdjson can't represent an integer outside 64 bits
+                    # (NUMBER_ERROR / BIGINT_ERROR) - either way hand the line to the
+                    # regular parser, which also reports genuinely malformed JSON
+                    data = _loads(raw_line)
+                    is_object = isinstance(data, dict)
+            else:
+                data = _loads(raw_line)
+                is_object = isinstance(data, dict)
+            logger.debug("Parsed JSON: %s", data)
 
             # validate JSON-RPC format
-            if not isinstance(data, dict):
+            if not is_object:
                 logger.error("Message is not a JSON object")
                 return None
 
             if data.get('jsonrpc') != '2.0':
-                logger.error(f"Invalid jsonrpc version: {data.get('jsonrpc')}")
+                logger.error("Invalid jsonrpc version: %s", data.get('jsonrpc'))
                 return None
 
-            # create JsonRpcMessage object
-            message = JsonRpcMessage(
-                jsonrpc=data['jsonrpc'],
-                method=data.get('method'),
-                params=data.get('params'),
-                id=data.get('id'),
-                result=data.get('result'),
-                error=data.get('error')
-            )
-
-            logger.debug(f"Created message: request={message.is_request()}, "
-                        f"notification={message.is_notification()}, "
-                        f"response={message.is_response()}")
-
-            return message
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            logger.error(f"Invalid JSON line: {raw_line}")
+            # no intermediate message object - the dispatcher reads fields straight from data
+            return data
+
+        except ValueError as e:
+            # json and orjson both raise a ValueError subclass (JSONDecodeError)
+            logger.error("JSON decode error: %s", e)
+            logger.error("Invalid JSON line: %s", raw_line)
             return None
         except Exception as e:
-            logger.error(f"Error parsing message: {e}")
+            logger.error("Error parsing message: %s", e)
             return None
 
         
-    def _dispatch_message(self, message: JsonRpcMessage) -> Optional[Dict[str, Any]]:
+    def _build_dispatcher(self) -> Callable[[Any], Optional[Union[bytes, Dict[str, Any]]]]:
         """
-        STEP 3: Dispatch message to the appropriate handler.
+        Build the STEP 3 dispatcher as a closure over the handler table.
 
-        Args:
-            message: The parsed JSON-RPC message
-
-        Returns:
-            Response dictionary to send back, or None for notifications
-        
-        Notes: 
-            - Routes requests to registered handlers
-            - Handles method not found errors
-            - Generates proper JSON-RPC error responses
-            - Notifications don't generate responses
+        Everything the dispatcher touches per message is bound to a closure
+        variable up front, so dispatching pays no self.* attribute or module
+        global lookups.
         """
-        if message.is_response():
-            # this is a response to our request - shouldn't happen in server. Ignore it
-            logger.warning("Received response message - ignoring")
-            return None
+        get_handler = self.handlers.get
+        emit_success = self._emit_success
+        create_error_response = self._create_error_response
+        materialize = _materialize
+        log = logger
+
+        def dispatch_message(data: Any) -> Optional[Union[bytes, Dict[str, Any]]]:
+            """
+            STEP 3: Dispatch message to the appropriate handler.
+
+            Args:
+                data: The parsed JSON-RPC message object (dict or lazy simdjson Object)
+
+            Returns:
+                Response to send back (pre-serialized bytes for successes, a dict
+                for errors), or None for notifications
         
-        if not (message.is_request() or message.is_notification()):
-            logger.error("Message is neither a request or a notification")
-            return None
+            Notes: 
+                - Routes requests to registered handlers
+                - Handles method not found errors
+                - Generates proper JSON-RPC error responses
+                - Notifications don't generate responses
+            """
+            # classify the message (request / notification / response), reading each field once
+            method = data.get('method')
+            msg_id = materialize(data.get('id'))
+            has_method = method is not None
+            has_id = msg_id is not None
+            is_request = has_method and has_id
+
+            if not has_method and has_id:
+                # this is a response to our request - shouldn't happen in server. Ignore it
+                log.warning("Received response message - ignoring")
+                return None
+        
+            if not has_method:
+                log.error("Message is neither a request or a notification")
+                return None
 
-        method = message.method
-        logger.info(f"Dispatch method: {method}")
+            # a non-string method (e.g. a list) can't be a handler key - reject it
+            # here rather than letting the lookup raise
+            if type(method) is not str:
+                log.error("Invalid method type: %s", type(method).__name__)
 
-        # check if we have a handler for this method
-        if method not in self.handlers:
-            logger.error(f"Not handler for method: {method}")
+                # requests still get an answer; notifications are just dropped
+                if is_request:
+                    return create_error_response(msg_id, -32600, "Invalid Request")
+                return None
 
-            # only send error response for request (not notifications)
-            if message.is_request():
-                return self._create_error_response(
-                    message.id,
-                    -32601,
-                    f"Method not found: {method}"
-                )
-            return None
+            log.info("Dispatch method: %s", method)
 
-        try:
-            # call the handler
-            hander = self.handlers[method]
-            result = hander(message.params, message.id)
+            # check if we have a handler for this method (single lookup)
+            hander = get_handler(method)
+            if hander is None:
+                log.error("Not handler for method: %s", method)
 
-            # only send a response for requests, not notifications
-            if message.is_request():
-                return self._create_success_response(message.id, result)
-            return None
+                # only send error response for request (not notifications)
+                if is_request:
+                    return create_error_response(
+                        msg_id,
+                        -32601,
+                        f"Method not found: {method}"
+                    )
+                return None
 
-        except Exception as e:
-            logger.error(f"Handler error for {method}: {e}", exc_info=True)
-
-            # also only send an error response for requests
-            if message.is_request():
-                return self._create_error_response(
-                    message.id,
-                    -32603,
-                    f"Internal error: {str(e)}"
-                )
-            return None
+            try:
+                # call the handler
+                # params may still be a lazy simdjson proxy - handlers get plain objects
+                result = hander(materialize(data.get('params')), msg_id)
+
+                # only send a response for requests, not notifications
+                if is_request:
+                    return emit_success(msg_id, result)
+                return None
+
+            except Exception as e:
+                # no traceback here - the error is reported back to the client
+                log.error("Handler error for %s: %s", method, e)
+
+                # also only send an error response for requests
+                if is_request:
+                    return create_error_response(
+                        msg_id,
+                        -32603,
+                        f"Internal error: {str(e)}"
+                    )
+                return None
 
-    def _write_response_to_stdout(self, response: Dict[str, Any]):
+        return dispatch_message
+
+    def _write_response_to_stdout(self, response: Union[bytes, Dict[str, Any]]):
         """
         STEP 4: Write JSON response to stdout.
 
         Args:
-            response: The response dictionary to send
+            response: The response to send - already serialized bytes, or a dictionary
 
         Notes:
             - Serializes response as single line JSON
@@ -295,18 +557,22 @@ class MCPServer:
             - Critical: only protocol messages go to stdout
         """
         try: 
-            # serialize as single-line JSON 
-            json_response = json.dumps(response, separators=(',', ':'))
+            # serialize as single-line JSON (success replies arrive pre-serialized)
+            if isinstance(response, bytes):
+                json_response = response
+            else:
+                json_response = _dumps(response)
 
             # write to stdout with new line terminator
-            sys.stdout.write(json_response + '\n')
+            self._send_frame(json_response)
 
-            logger.debug(f"Sent response: {json_response[:100]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sent response: %s...", json_response[:100])
         
         except Exception as e:
-            logger.error(f"Error writing response: {e}")
-            logger.error(f"Response type: {type(response)}")
-            logger.error(f"Response content: {response}")
+            logger.error("Error writing response: %s", e)
+            logger.error("Response type: %s", type(response))
+            logger.error("Response content: %s", response)
             
             # try to send back error response
             try:
@@ -318,11 +584,28 @@ class MCPServer:
                         "message": "Response serialization failed"
                     }
                 }
-                json_error = json.dumps(error_response, separators=(',', ':'))
-                sys.stdout.write(json_error + '\n')
+                json_error = _dumps(error_response)
+                self._send_frame(json_error)
             except:
                 logger.error("Failed to send error message")
         
+    def _send_frame(self, payload: bytes):
+        """Write one serialized message to stdout, newline-terminated or Content-Length framed."""
+        # separate writes rather than building a concatenated copy - the
+        # buffered writer already collects them
+        write = self._stdout.write
+        if self._length_prefixed:
+            write(_CONTENT_LENGTH_HEADER % len(payload))
+            write(payload)
+        else:
+            write(payload)
+            write(b'\n')
+
+        # the initialize response has gone out - switch framing for everything after it
+        if self._length_prefixed_pending:
+            self._length_prefixed_pending = False
+            self._length_prefixed = True
+
     # need to flush so it doesn't just sit in the buffer
     def _flush_stdout(self):
         """
@@ -331,21 +614,39 @@ class MCPServer:
         Notes: 
         - Critical for real time communication
         - Ensures messages are sent immediately 
-        - Should be called after every message
+        - Should be called before blocking on the next read
         """
         try:
-            sys.stdout.flush()
+            self._stdout.flush()
             logger.debug("Flushed stdout")
         except Exception as e:
-            logger.error(f"Error flushing stdout {e}")
+            logger.error("Error flushing stdout %s", e)
 
-    def _create_success_response(self, request_id: Any, result: Any) -> Dict[str, Any]:
-        """Create a JSON-RPC success response."""
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": result
-        }
+    def _input_pending(self) -> bool:
+        """
+        Check (without blocking) whether more input is waiting on stdin.
+
+        Notes:
+            - Only sees data queued at the OS level, so a False answer may still
+              leave lines in our read buffer - that just means an extra flush
+            - EOF also counts as readable; the loop flushes before exiting on EOF
+            - Falls back to False where select() can't poll stdin (e.g. Windows pipes)
+        """
+        try:
+            readable, _, _ = select.select([self._stdin], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return bool(readable)
+
+    def _emit_success(self, request_id: Any, result: Any) -> Union[bytes, Dict[str, Any]]:
+        """Serialize a JSON-RPC success response directly to bytes."""
+        try:
+            # the ping result is constant, so skip serializing it
+            body = _PONG_RESULT if result is _PONG else _dumps(result)
+            return _SUCCESS_TEMPLATE % (_dumps(request_id), body)
+        except Exception as e:
+            logger.error("Error serializing result: %s", e)
+            return self._create_error_response(request_id, -32603, "Response serialization failed")
 
     def _create_error_response(self, request_id: Any, code: int, message: str) -> Dict[str, Any]:
         """Create a JSON-RPC error response"""
@@ -379,6 +680,17 @@ class MCPServer:
             }
         }
         
+        # opt in to length-prefixed framing if the client asks for it. Only for
+        # requests - a notification gets no response to switch after
+        client_capabilities = params.get('capabilities') if isinstance(params, dict) else None
+        if (isinstance(client_capabilities, dict)
+                and client_capabilities.get('framing') == _FRAMING_LENGTH_PREFIXED
+                and request_id is not None
+                and not self._length_prefixed):
+            logger.info("Switching to length-prefixed framing after initialize")
+            capabilities["capabilities"]["framing"] = _FRAMING_LENGTH_PREFIXED
+            self._length_prefixed_pending = True
+
         self.initialized = True
         return capabilities
     
@@ -390,7 +702,7 @@ class MCPServer:
     def _handle_ping(self, params: Optional[Dict], request_id: Any) -> Dict[str, str]:
         """Handle ping request for connectivity testing."""
         logger.debug("Handling ping request")
-        return {"status": "pong"}
+        return _PONG
 
     def _cleanup(self):
         """Clean up resources before shutdown."""